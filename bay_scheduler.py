@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+
+import heapq
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta
+
+
+class BayScheduler:
+    """Track treatment bay bookings and hand out free bays to waiting patients"""
+    def __init__(self, bay_count, slot_minutes=30):
+        self.bay_count = bay_count
+        self.slot = timedelta(minutes=slot_minutes)
+
+        # Per-bay interval index. Bookings in one bay never overlap, so
+        # keeping starts and ends sorted side by side is enough to answer
+        # overlap questions with a single bisect. A bay only holds one
+        # shift's worth of bookings, so list inserts stay cheap.
+        self._starts = [[] for _ in range(bay_count)]
+        self._ends = [[] for _ in range(bay_count)]
+        self._patients = [[] for _ in range(bay_count)]
+
+        # When each bay's last booking ends, plus a heap over the same
+        # values (entries go stale and are skipped lazily)
+        self._free_at = [datetime.min] * bay_count
+        self._free_heap = [(datetime.min, index) for index in range(bay_count)]
+
+    def _index(self, bay):
+        """Convert a 1-based bay number to a list index"""
+        if not 1 <= bay <= self.bay_count:
+            raise ValueError(f"Bay {bay} does not exist (1-{self.bay_count}).")
+        return bay - 1
+
+    def is_bay_free(self, bay, start, end):
+        """Check whether a bay has no booking overlapping [start, end)"""
+        index = self._index(bay)
+        starts = self._starts[index]
+
+        # Only the last booking starting before `end` can overlap
+        i = bisect_left(starts, end)
+        return i == 0 or self._ends[index][i - 1] <= start
+
+    def free_bays(self, start, end):
+        """Return the bay numbers that are free for the whole of [start, end)
+
+        Checks each bay with one bisect, so this is linear in the number of
+        bays. A bay can be free in a gap between two bookings, which a
+        single per-bay "free from" value cannot capture, and a few hundred
+        bisects cost well under a millisecond.
+        """
+        return [bay for bay in range(1, self.bay_count + 1) if self.is_bay_free(bay, start, end)]
+
+    def _next_gap(self, index, now, length):
+        """Earliest time at or after `now` when a bay is free for `length`"""
+        starts = self._starts[index]
+        ends = self._ends[index]
+
+        # Start after whatever booking is running at `now`, then step past
+        # every booking that would cut the gap short
+        i = bisect_right(starts, now)
+        candidate = max(now, ends[i - 1]) if i > 0 else now
+        while i < len(starts) and starts[i] < candidate + length:
+            candidate = max(candidate, ends[i])
+            i += 1
+        return candidate
+
+    def next_free_bay(self, now=None, length=None):
+        """Return (bay, free_from) for the earliest gap of `length` at or after `now`
+
+        `length` defaults to one slot. A bay whose last booking has already
+        ended is found from the heap straight away; otherwise every bay is
+        checked for gaps between its bookings.
+        """
+        now = now or datetime.now()
+        length = length or self.slot
+
+        while self._free_heap:
+            free_at, index = self._free_heap[0]
+            if free_at == self._free_at[index]:
+                break
+            heapq.heappop(self._free_heap)
+
+        if self._free_heap and self._free_heap[0][0] <= now:
+            return self._free_heap[0][1] + 1, now
+
+        best = None
+        for index in range(self.bay_count):
+            free_from = self._next_gap(index, now, length)
+            if best is None or free_from < best[1]:
+                best = (index + 1, free_from)
+        return best
+
+    def book(self, bay, start, end, patient=None):
+        """Reserve a bay for [start, end), raising ValueError on a clash"""
+        if end <= start:
+            raise ValueError("Booking must end after it starts.")
+        if not self.is_bay_free(bay, start, end):
+            raise ValueError(f"Bay {bay} is already booked during that time.")
+
+        index = self._index(bay)
+        i = bisect_right(self._starts[index], start)
+        self._starts[index].insert(i, start)
+        self._ends[index].insert(i, end)
+        self._patients[index].insert(i, patient)
+
+        if end > self._free_at[index]:
+            self._free_at[index] = end
+            heapq.heappush(self._free_heap, (end, index))
+
+    def release_bay(self, bay, at=None):
+        """End the booking running in a bay at the given time (default now)"""
+        at = at or datetime.now()
+        index = self._index(bay)
+        starts = self._starts[index]
+        ends = self._ends[index]
+
+        i = bisect_right(starts, at) - 1
+        if i < 0 or ends[i] <= at:
+            return None
+
+        patient = self._patients[index][i]
+        if starts[i] == at:
+            # Booking had not started yet, drop it altogether
+            del starts[i], ends[i], self._patients[index][i]
+        else:
+            ends[i] = at
+
+        if i >= len(ends) - 1:
+            self._free_at[index] = ends[-1] if ends else datetime.min
+            heapq.heappush(self._free_heap, (self._free_at[index], index))
+        return patient
+
+    def bookings(self, bay):
+        """Return (start, end, patient) tuples for a bay in time order"""
+        index = self._index(bay)
+        return list(zip(self._starts[index], self._ends[index], self._patients[index]))
+
+    def call_next_patients(self, queue, now=None):
+        """Call one patient from the queue for every bay free for the next slot"""
+        now = now or datetime.now()
+        end = now + self.slot
+
+        bays = self.free_bays(now, end)
+        patients = queue.call_patients(len(bays), called_at=now)
+
+        assignments = []
+        for bay, patient in zip(bays, patients):
+            self.book(bay, now, end, patient)
+            assignments.append((bay, patient))
+        return assignments
@@ -3,21 +3,24 @@
 #Exercise 1:
 def cube(n):
 	return n ** 3
-x = cube(3)
-print(x)
+
+if __name__ == "__main__":
+	x = cube(3)
+	print(x)
 
 
 #Exercise 2:
 def area_of_triangle(width, height):
 	return 0.5 * width * height
 
-width = float(input("Enter the width: "))
-height = float(input(" Enter the height: "))
+if __name__ == "__main__":
+	width = float(input("Enter the width: "))
+	height = float(input(" Enter the height: "))
 
-area = area_of_triangle(width, height)
+	area = area_of_triangle(width, height)
 
 
-print(f"The area of the triangle is: {area}.")
+	print(f"The area of the triangle is: {area}.")
 
 
 #Exercise 3:
@@ -27,12 +30,13 @@ def is_even(n):
 	else:
 		return False
 
-number = int(input("Enter a number: "))
+if __name__ == "__main__":
+	number = int(input("Enter a number: "))
 
-if is_even(number):
-	print("This is an even number.")
-else:
-	print("This is an odd number.")
+	if is_even(number):
+		print("This is an even number.")
+	else:
+		print("This is an odd number.")
 
 #Exercise 4:
 def calculate_risk(open_ports, has_smb, has_ssh):
@@ -47,11 +51,12 @@ def calculate_risk(open_ports, has_smb, has_ssh):
 		risk = 10
 	return risk
 	
-risk_a = calculate_risk(3, True, False)
-risk_b = calculate_risk(10, False, True)
+if __name__ == "__main__":
+	risk_a = calculate_risk(3, True, False)
+	risk_b = calculate_risk(10, False, True)
 
-print(f"Host A risk score: {risk_a}/10")
-print(f"Host B risk score: {risk_b}/10")
+	print(f"Host A risk score: {risk_a}/10")
+	print(f"Host B risk score: {risk_b}/10")
 
 #Exercise 5:
 def password_strength(length, has_uppercase, has_symbols):
@@ -66,13 +71,14 @@ def password_strength(length, has_uppercase, has_symbols):
 		strength = 10
 	return strength
 		
-strength_a = password_strength(6, False, False)
-strength_b = password_strength(10, True, True)
-strength_c = password_strength(12, True, False)
-
-print(f"Password A strength: {strength_a}/10")
-print(f"password B strength: {strength_b}/10")
-print(f"password C strength: {strength_c}/10")
+if __name__ == "__main__":
+	strength_a = password_strength(6, False, False)
+	strength_b = password_strength(10, True, True)
+	strength_c = password_strength(12, True, False)
+
+	print(f"Password A strength: {strength_a}/10")
+	print(f"password B strength: {strength_b}/10")
+	print(f"password C strength: {strength_c}/10")
 
 #Exercise 6:
 
@@ -16,20 +16,18 @@ class PortList:
 
 # --- using the class ---
 
-target = PortList("10.0.2.5", [22, 80, 443])
+if __name__ == "__main__":
+    target = PortList("10.0.2.5", [22, 80, 443])
 
-print("Open ports:", target.open_ports)
-
-print("Is 22 open?", target.has_port(22))
-print("Is 21 open?", target.has_port(21))
-
-num = target.count_ports()
-print("Number of open ports:", num)
-
-if target.has_port(22):
-    print("Port 22 is open, try SSH brute-force…")
-else:
-    print("No SSH here.")
+    print("Open ports:", target.open_ports)
 
+    print("Is 22 open?", target.has_port(22))
+    print("Is 21 open?", target.has_port(21))
 
+    num = target.count_ports()
+    print("Number of open ports:", num)
 
+    if target.has_port(22):
+        print("Port 22 is open, try SSH brute-force…")
+    else:
+        print("No SSH here.")
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+
+import os
+import re
+import json
+import fnmatch
+import argparse
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+CACHE_VERSION = 2
+
+# What happened to a directory during a crawl
+SCANNED, CACHED, FAILED = "scanned", "cached", "failed"
+
+
+class StatCache:
+    """Persisted listing of every directory seen by the crawler
+
+    Each directory keeps its mtime, inode, the names of the files that
+    match the crawl pattern and its subdirectories. Nothing is kept for
+    files that do not match, so a cache only serves one pattern.
+    """
+    def __init__(self, path=None):
+        self.path = path
+        self.pattern = None
+        self.dirs = {}
+        self.dirty = False
+
+        if path and os.path.exists(path):
+            self.load()
+
+    def load(self):
+        """Read the cache file, starting empty if it is missing or stale"""
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+
+        if data.get("version") == CACHE_VERSION:
+            self.pattern = data.get("pattern")
+            self.dirs = data.get("dirs", {})
+
+    def save(self):
+        """Write the cache next to a temp file and swap it in, if it changed"""
+        if not self.path or not self.dirty:
+            return
+
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"version": CACHE_VERSION, "pattern": self.pattern, "dirs": self.dirs}, f)
+        os.replace(tmp_path, self.path)
+        self.dirty = False
+
+    def use_pattern(self, pattern):
+        """Drop every listing if they were made for a different pattern"""
+        if pattern != self.pattern:
+            self.pattern = pattern
+            self.dirs = {}
+            self.dirty = True
+
+    def lookup(self, dir_path, st):
+        """Return (matches, subdirs) if the directory has not changed since"""
+        entry = self.dirs.get(dir_path)
+        if entry is None:
+            return None
+
+        # Adding, removing or renaming a child bumps the directory mtime,
+        # and a new inode means the directory itself was replaced
+        mtime, inode, matches, subdirs = entry
+        if mtime != st.st_mtime_ns or inode != st.st_ino:
+            return None
+        return matches, subdirs
+
+    def store(self, dir_path, st, matches, subdirs):
+        """Remember a fresh listing for a directory"""
+        self.dirs[dir_path] = [st.st_mtime_ns, st.st_ino, matches, subdirs]
+        self.dirty = True
+
+    def forget(self, dir_path):
+        """Remove a directory that has gone or can no longer be read"""
+        if self.dirs.pop(dir_path, None) is not None:
+            self.dirty = True
+
+
+class DirectoryCrawler:
+    """Walk a directory tree with os.scandir across a pool of threads
+
+    With with_stats=True the crawl yields (path, size, mtime_ns, inode)
+    instead of plain paths. Stats are never cached, since editing a file in
+    place does not touch its directory's mtime; only matching files are
+    stat'ed, on every run.
+    """
+    def __init__(self, pattern="*", workers=8, cache=None, follow_symlinks=False, with_stats=False):
+        self.pattern = pattern
+        self.workers = workers
+
+        # fnmatch.fnmatch normalises and looks up the pattern on every call;
+        # compile it once since it runs for every file in the tree
+        self._match_name = re.compile(fnmatch.translate(os.path.normcase(pattern))).match
+        self.cache = cache if cache is not None else StatCache()
+        self.follow_symlinks = follow_symlinks
+        self.with_stats = with_stats
+
+        # Counters from the last crawl, handy for checking the cache works
+        self.scanned_dirs = 0
+        self.cached_dirs = 0
+        self.failed_dirs = 0
+
+    def _stat_files(self, dir_path, names):
+        """Return (name, size, mtime_ns, inode) for the named files that still exist"""
+        stats = []
+        for name in names:
+            try:
+                info = os.stat(os.path.join(dir_path, name), follow_symlinks=self.follow_symlinks)
+            except OSError:
+                continue
+            stats.append((name, info.st_size, info.st_mtime_ns, info.st_ino))
+        return stats
+
+    def _scan_dir(self, dir_path):
+        """List one directory, reusing the cached listing when unchanged"""
+        try:
+            st = os.stat(dir_path)
+        except OSError:
+            return dir_path, FAILED, None, [], [], []
+
+        cached = self.cache.lookup(dir_path, st)
+        if cached is not None:
+            matches, subdirs = cached
+            stats = self._stat_files(dir_path, matches) if self.with_stats else []
+            return dir_path, CACHED, st, matches, subdirs, stats
+
+        matches = []
+        subdirs = []
+        stats = []
+        try:
+            with os.scandir(dir_path) as it:
+                for item in it:
+                    try:
+                        if item.is_dir(follow_symlinks=self.follow_symlinks):
+                            subdirs.append(item.name)
+                        elif self._match_name(os.path.normcase(item.name)) and item.is_file(follow_symlinks=self.follow_symlinks):
+                            matches.append(item.name)
+                            if self.with_stats:
+                                info = item.stat(follow_symlinks=self.follow_symlinks)
+                                stats.append((item.name, info.st_size, info.st_mtime_ns, info.st_ino))
+                    except OSError:
+                        # Entry vanished or is unreadable, skip it
+                        continue
+        except OSError:
+            return dir_path, FAILED, None, [], [], []
+
+        return dir_path, SCANNED, st, matches, subdirs, stats
+
+    def crawl(self, root):
+        """Yield the files under root that match the pattern"""
+        self.scanned_dirs = 0
+        self.cached_dirs = 0
+        self.failed_dirs = 0
+        self.cache.use_pattern(self.pattern)
+        root = os.path.abspath(root)
+        seen = set()
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            pending = {pool.submit(self._scan_dir, root)}
+            seen.add(root)
+
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    dir_path, status, st, matches, subdirs, stats = future.result()
+
+                    # Cache writes stay on this thread so no locking is needed
+                    if status == FAILED:
+                        self.cache.forget(dir_path)
+                        self.failed_dirs += 1
+                        continue
+
+                    if status == SCANNED:
+                        self.cache.store(dir_path, st, matches, subdirs)
+                        self.scanned_dirs += 1
+                    else:
+                        self.cached_dirs += 1
+
+                    for name in subdirs:
+                        sub_path = os.path.join(dir_path, name)
+                        if sub_path not in seen:
+                            seen.add(sub_path)
+                            pending.add(pool.submit(self._scan_dir, sub_path))
+
+                    if self.with_stats:
+                        for name, size, mtime, inode in stats:
+                            yield os.path.join(dir_path, name), size, mtime, inode
+                    else:
+                        for name in matches:
+                            yield os.path.join(dir_path, name)
+
+        # Drop directories that no longer exist under this root
+        prefix = root + os.sep
+        for dir_path in list(self.cache.dirs):
+            if (dir_path == root or dir_path.startswith(prefix)) and dir_path not in seen:
+                self.cache.forget(dir_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Crawl a directory tree for matching files.")
+    parser.add_argument("root", nargs="?", default=".", help="directory to crawl")
+    parser.add_argument("-p", "--pattern", default="*.py", help="filename pattern, e.g. *.py")
+    parser.add_argument("-w", "--workers", type=int, default=8, help="number of scanning threads")
+    parser.add_argument("-c", "--cache", default=".crawl_cache.json", help="stat cache file")
+    parser.add_argument("-s", "--stat", action="store_true", help="print each file's size too")
+    args = parser.parse_args()
+
+    cache = StatCache(args.cache)
+    crawler = DirectoryCrawler(args.pattern, args.workers, cache, with_stats=args.stat)
+
+    count = 0
+    for result in crawler.crawl(args.root):
+        if args.stat:
+            path, size, mtime, inode = result
+            print(f"{size:>12}  {path}")
+        else:
+            print(result)
+        count += 1
+
+    cache.save()
+    print(f"{count} file(s) matched. "
+          f"Scanned {crawler.scanned_dirs} dir(s), reused {crawler.cached_dirs} from cache, "
+          f"{crawler.failed_dirs} unreadable.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+
+import queue
+import time
+import traceback
+
+
+class UpdatePipeline:
+    """Apply queue changes from any thread and redraw the GUI at a capped rate
+
+    Worker threads call submit() to hand over a change. The Tk main loop
+    drains the channel on a timer with root.after, applies the changes in
+    a batch and then redraws once, so a burst of events costs one redraw
+    per frame instead of one per event.
+    """
+    def __init__(self, root, redraw, max_fps=10, time_budget=0.5):
+        self.root = root
+        self.redraw = redraw
+        self.frame_ms = max(1, int(1000 / max_fps))
+
+        # Fraction of each frame that may be spent applying events, so the
+        # rest is left for Tk to handle clicks and repaints
+        self.time_budget = self.frame_ms / 1000 * time_budget
+
+        self.events = queue.SimpleQueue()
+        self.dirty = False
+        self.running = False
+
+        # Id of the scheduled tick, so stop() can cancel it
+        self.after_id = None
+
+    def start(self):
+        """Begin polling the channel from the Tk main loop"""
+        if not self.running:
+            self.running = True
+            self.after_id = self.root.after(self.frame_ms, self._tick)
+
+    def stop(self):
+        """Stop polling; events already submitted stay in the channel"""
+        self.running = False
+        if self.after_id is not None:
+            self.root.after_cancel(self.after_id)
+            self.after_id = None
+
+    def submit(self, action, *args):
+        """Queue a change to run on the main thread (safe from any thread)"""
+        self.events.put((action, args))
+
+    def request_redraw(self):
+        """Ask for a redraw on the next frame (main thread only)"""
+        self.dirty = True
+
+    def _tick(self):
+        """Apply pending events within the time budget, then redraw once"""
+        self.after_id = None
+        if not self.running:
+            return
+
+        try:
+            deadline = time.perf_counter() + self.time_budget
+            while time.perf_counter() < deadline:
+                try:
+                    action, args = self.events.get_nowait()
+                except queue.Empty:
+                    break
+
+                # One bad event from a feed must not stop the rest
+                try:
+                    action(*args)
+                except Exception:
+                    traceback.print_exc()
+                self.dirty = True
+
+            if self.dirty:
+                self.dirty = False
+                self.redraw()
+        finally:
+            # An event may have called stop()
+            if self.running:
+                self.after_id = self.root.after(self.frame_ms, self._tick)
@@ -1,9 +1,15 @@
 #!/usr/bin/env python3
 
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog
+import argparse
 import heapq
 from datetime import datetime
+from bay_scheduler import BayScheduler
+from served_history import ServedHistory
+from gui_updates import UpdatePipeline
+from patient_report import SEVERITY_TEXT, get_report_page, page_count, export_report, report_order
+from queue_snapshot import QueueSnapshotPublisher
 
 class Patient:
     """Patient class to store patient information"""
@@ -54,17 +60,21 @@ class Patient:
         return total_score
     
     def __lt__(self, other):
-        # For heapq to compare patients based on priority_score
-        return self.priority_score < other.priority_score
+        # For heapq to compare patients based on priority_score, with ties
+        # going to whoever was added first (same order as report_order)
+        return report_order(self) < report_order(other)
     
     def __repr__(self):
         return f"{self.name} (Severity: {self.severity_level}, Priority: {self.priority_score})"
 
 class PriorityQueue:
     """Priority queue implementation for patients"""
-    def __init__(self):
+    def __init__(self, history=None):
         self.patients = []
         self.next_patient_id = 1
+        
+        # Record of patients already called, kept across queue resets
+        self.history = history if history is not None else ServedHistory()
     
     def add_patient(self, patient):
         """Add a patient to the priority queue"""
@@ -75,9 +85,35 @@ class PriorityQueue:
     def call_patient(self):
         """Remove and return the patient with highest priority (lowest score)"""
         if self.patients:
-            return heapq.heappop(self.patients)
+            patient = heapq.heappop(self.patients)
+            self.history.record(patient)
+            return patient
         return None
     
+    def call_patients(self, count, called_at=None):
+        """Remove and return up to `count` highest priority patients in order"""
+        if count <= 0 or not self.patients:
+            return []
+        
+        if count >= len(self.patients):
+            called = sorted(self.patients, key=report_order)
+            self.patients = []
+        elif count < len(self.patients) // 8:
+            # Popping one at a time is cheapest for a few patients; the heap
+            # breaks ties the same way as report_order
+            called = [heapq.heappop(self.patients) for _ in range(count)]
+        else:
+            # For a large batch take them all at once and re-heapify the rest
+            called = heapq.nsmallest(count, self.patients, key=report_order)
+            taken = {id(patient) for patient in called}
+            self.patients = [patient for patient in self.patients if id(patient) not in taken]
+            heapq.heapify(self.patients)
+        
+        called_at = called_at or datetime.now()
+        for patient in called:
+            self.history.record(patient, called_at)
+        return called
+    
     def peek_next_patient(self):
         """View next patient without removing"""
         if self.patients:
@@ -97,12 +133,16 @@ class PriorityQueue:
         self.patients = []
         self.next_patient_id = 1
     
+    def get_top_patients(self, count):
+        """Return the `count` highest priority patients without removing them"""
+        return heapq.nsmallest(count, self.patients, key=report_order)
+    
     def get_all_patients(self):
         """Return all patients in priority order without removing them"""
-        return sorted(self.patients, key=lambda x: x.priority_score)
+        return sorted(self.patients, key=report_order)
 
 class HospitalQueueSystem:
-    def __init__(self, root):
+    def __init__(self, root, snapshot=None):
         self.root = root
         self.root.title("Hospital Priority Queue System")
         self.root.geometry("1000x700")
@@ -111,11 +151,38 @@ class HospitalQueueSystem:
         # Initialize priority queue
         self.queue = PriorityQueue()
         
+        # Optional QueueSnapshotPublisher that dashboards in other processes read
+        self.snapshot = snapshot
+        
+        # Most rows the queue table shows at once
+        self.display_limit = 500
+        
+        # Treatment bays that called patients are sent to
+        self.bays = BayScheduler(bay_count=4, slot_minutes=30)
+        
         # Add some sample patients for demonstration
         self.add_sample_patients()
         
         # Setup GUI
         self.setup_gui()
+        
+        # Changes from other threads and redraw requests go through here
+        self.updates = UpdatePipeline(self.root, self.update_queue_display, max_fps=10)
+        self.updates.start()
+        
+        # Clean up the snapshot block when the window is closed
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+    
+    def on_close(self):
+        """Stop background updates, remove the shared snapshot and close"""
+        self.updates.stop()
+        if self.snapshot is not None:
+            self.snapshot.close()
+        self.root.destroy()
+    
+    def admit_patient(self, patient):
+        """Add a patient from any thread (e.g. a bulk import or network feed)"""
+        self.updates.submit(self.queue.add_patient, patient)
     
     def add_sample_patients(self):
         """Add some sample patients for demonstration purposes"""
@@ -171,8 +238,10 @@ class HospitalQueueSystem:
             ("3. Add New Patient", self.open_add_patient_window),
             ("4. Check If Queue Is Empty", self.check_queue_empty),
             ("5. Reset Queue", self.reset_queue),
+            ("Fill Free Bays", self.fill_free_bays),
             ("View All Patients", self.view_all_patients),
-            ("View Next Patient", self.view_next_patient)
+            ("View Next Patient", self.view_next_patient),
+            ("View Wait Statistics", self.view_wait_statistics)
         ]
         
         for text, command in buttons_info:
@@ -239,11 +308,11 @@ class HospitalQueueSystem:
     def update_queue_display(self):
         """Update the treeview with current queue data"""
         # Clear existing items
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+        self.tree.delete(*self.tree.get_children())
         
-        # Get all patients in priority order
-        patients = self.queue.get_all_patients()
+        # Get the first screenful of patients in priority order; redrawing
+        # thousands of rows every frame would stall the main loop
+        patients = self.queue.get_top_patients(self.display_limit)
         
         # Insert patients into treeview
         for patient in patients:
@@ -261,20 +330,20 @@ class HospitalQueueSystem:
                 arrival_time
             ))
         
+        # Share the new state with any reader processes
+        if self.snapshot is not None:
+            self.snapshot.publish(self.queue)
+        
         # Update status bar
         queue_size = self.queue.get_queue_size()
-        self.status_bar.config(text=f"Queue contains {queue_size} patient(s).")
+        if queue_size > self.display_limit:
+            self.status_bar.config(text=f"Queue contains {queue_size} patient(s). Showing the first {self.display_limit}.")
+        else:
+            self.status_bar.config(text=f"Queue contains {queue_size} patient(s).")
     
     def get_severity_text(self, level):
         """Convert severity level to text"""
-        severity_map = {
-            1: "Critical",
-            2: "Urgent",
-            3: "Moderate",
-            4: "Low",
-            5: "Non-urgent"
-        }
-        return severity_map.get(level, "Unknown")
+        return SEVERITY_TEXT.get(level, "Unknown")
     
     def check_queue_size(self):
         """Button 1: Check number of patients in queue"""
@@ -306,12 +375,34 @@ class HospitalQueueSystem:
         )
         
         # Update display
-        self.update_queue_display()
+        self.updates.request_redraw()
         
         # Check if queue is now empty
         if self.queue.is_empty():
             messagebox.showinfo("Queue Empty", "All patients have been served. Queue is now empty.")
     
+    def fill_free_bays(self):
+        """Call one patient for every treatment bay that is free right now"""
+        if self.queue.is_empty():
+            messagebox.showwarning("Queue Empty", "The queue is empty. No patients to call.")
+            return
+        
+        assignments = self.bays.call_next_patients(self.queue)
+        if not assignments:
+            bay, free_at = self.bays.next_free_bay()
+            messagebox.showinfo(
+                "No Free Bays", 
+                f"All treatment bays are busy. Bay {bay} is next free for a full slot from {free_at.strftime('%H:%M:%S')}."
+            )
+            return
+        
+        message = "Patients directed to treatment bays:\n\n"
+        for bay, patient in assignments:
+            message += f"Bay {bay}: {patient.name} (Priority Score: {patient.priority_score})\n"
+        messagebox.showinfo("Patients Called", message)
+        
+        self.updates.request_redraw()
+    
     def open_add_patient_window(self):
         """Button 3: Open window to add new patient"""
         add_window = tk.Toplevel(self.root)
@@ -421,7 +512,7 @@ class HospitalQueueSystem:
             self.queue.add_patient(patient)
             
             # Update display
-            self.update_queue_display()
+            self.updates.request_redraw()
             
             # Show confirmation
             messagebox.showinfo("Patient Added", f"Patient {name} added to the queue with priority score {patient.priority_score}.")
@@ -478,7 +569,7 @@ class HospitalQueueSystem:
         
         if confirm:
             self.queue.reset_queue()
-            self.update_queue_display()
+            self.updates.request_redraw()
             messagebox.showinfo("Queue Reset", "The queue has been reset. All patients have been removed.")
     
     def view_all_patients(self):
@@ -487,34 +578,63 @@ class HospitalQueueSystem:
             messagebox.showinfo("Queue Empty", "The queue is empty.")
             return
         
-        patients = self.queue.get_all_patients()
-        
-        # Create a formatted message
-        message = "Current Queue (in priority order):\n\n"
-        for i, patient in enumerate(patients, 1):
-            severity_text = self.get_severity_text(patient.severity_level)
-            message += f"{i}. {patient.name}\n"
-            message += f"   Severity: {severity_text}, Priority Score: {patient.priority_score}\n"
-            message += f"   Age: {patient.age}, Temp: {patient.temperature}°C, BP: {patient.blood_pressure}\n\n"
+        page_size = 50
+        current_page = tk.IntVar(value=0)
         
-        # Show in a scrollable text box
+        # Show one page at a time in a scrollable text box
         view_window = tk.Toplevel(self.root)
         view_window.title("All Patients in Queue")
-        view_window.geometry("600x500")
+        view_window.geometry("600x550")
+        
+        page_label = tk.Label(view_window, font=("Arial", 11))
+        page_label.pack(pady=(10, 0))
         
         text_widget = tk.Text(view_window, wrap="word", font=("Arial", 11))
         text_widget.pack(fill="both", expand=True, padx=10, pady=10)
         
-        text_widget.insert("1.0", message)
-        text_widget.config(state="disabled")
+        def show_page(page):
+            """Render only the requested page of the report"""
+            pages = page_count(self.queue, page_size)
+            page = max(0, min(page, pages - 1))
+            current_page.set(page)
+            
+            text_widget.config(state="normal")
+            text_widget.delete("1.0", tk.END)
+            text_widget.insert("1.0", get_report_page(self.queue, page, page_size))
+            text_widget.config(state="disabled")
+            page_label.config(text=f"Current Queue (in priority order) - Page {page + 1} of {pages}")
+        
+        def export():
+            """Save the full report to a file"""
+            path = filedialog.asksaveasfilename(
+                parent=view_window, 
+                defaultextension=".txt", 
+                filetypes=[("Text files", "*.txt")]
+            )
+            if path:
+                count = export_report(self.queue, path)
+                messagebox.showinfo("Report Exported", f"Report of {count} patient(s) saved to {path}.", parent=view_window)
         
-        close_btn = tk.Button(
-            view_window, 
-            text="Close", 
-            font=("Arial", 12), 
-            command=view_window.destroy
-        )
-        close_btn.pack(pady=10)
+        button_frame = tk.Frame(view_window)
+        button_frame.pack(pady=10)
+        
+        buttons_info = [
+            ("< Previous", lambda: show_page(current_page.get() - 1)),
+            ("Next >", lambda: show_page(current_page.get() + 1)),
+            ("Export...", export),
+            ("Close", view_window.destroy)
+        ]
+        
+        for text, command in buttons_info:
+            button = tk.Button(
+                button_frame, 
+                text=text, 
+                font=("Arial", 12), 
+                command=command
+            )
+            button.pack(side="left", padx=5)
+        
+        show_page(0)
     
     def view_next_patient(self):
         """Additional feature: View next patient without calling"""
@@ -537,8 +657,51 @@ class HospitalQueueSystem:
             f"Arrival Time: {patient.arrival_time.strftime('%H:%M:%S')}"
         )
 
+    def view_wait_statistics(self):
+        """Additional feature: Wait times of recently served patients"""
+        history = self.queue.history
+        if history.total_served == 0:
+            messagebox.showinfo("No Data", "No patients have been served yet.")
+            return
+        
+        hours = 4
+        message = f"Wait times over the last {hours} hours:\n\n"
+        for level in range(1, 6):
+            served = history.served_count(severity=level, hours=hours)
+            if served == 0:
+                continue
+            median = history.wait_quantile(0.5, severity=level, hours=hours)
+            p95 = history.wait_quantile(0.95, severity=level, hours=hours)
+            message += (
+                f"{self.get_severity_text(level)}: {served} served, "
+                f"median {median / 60:.1f} min, p95 {p95 / 60:.1f} min\n"
+            )
+        message += f"\nTotal patients served: {history.total_served}"
+        
+        messagebox.showinfo("Wait Statistics", message)
+
 # Main application
 if __name__ == "__main__":
-    root = tk.Tk()
-    app = HospitalQueueSystem(root)
-    root.mainloop()
+    parser = argparse.ArgumentParser(description="Hospital Priority Queue System")
+    parser.add_argument(
+        "--publish-snapshot", 
+        nargs="?", 
+        const="", 
+        metavar="NAME", 
+        help="share the queue in shared memory for dashboards (optionally under NAME)"
+    )
+    args = parser.parse_args()
+    
+    snapshot = None
+    if args.publish_snapshot is not None:
+        snapshot = QueueSnapshotPublisher(name=args.publish_snapshot or None)
+        print(f"Publishing queue snapshot to shared memory block: {snapshot.name}")
+        print(f"Read it with: python3 queue_snapshot.py {snapshot.name}")
+    
+    try:
+        root = tk.Tk()
+        app = HospitalQueueSystem(root, snapshot=snapshot)
+        root.mainloop()
+    finally:
+        if snapshot is not None:
+            snapshot.close()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+
+import heapq
+import math
+
+SEVERITY_TEXT = {
+    1: "Critical",
+    2: "Urgent",
+    3: "Moderate",
+    4: "Low",
+    5: "Non-urgent"
+}
+
+REPORT_HEADER = "Current Queue (in priority order):\n\n"
+
+
+def report_order(patient):
+    """Sort key for the report; ties on priority go to whoever was added first"""
+    return patient.priority_score, getattr(patient, 'id', 0)
+
+
+def iter_patients_in_order(queue):
+    """Yield queued patients in priority order, one at a time
+
+    Pops from a heap built beside the queue, so only the patients actually
+    consumed are ever ordered and the queue itself is left untouched.
+    """
+    heap = [(report_order(patient), index, patient) for index, patient in enumerate(queue.patients)]
+    heapq.heapify(heap)
+    while heap:
+        yield heapq.heappop(heap)[2]
+
+
+def format_patient_entry(number, patient):
+    """Return the report text for one patient"""
+    severity_text = SEVERITY_TEXT.get(patient.severity_level, "Unknown")
+    return (
+        f"{number}. {patient.name}\n"
+        f"   Severity: {severity_text}, Priority Score: {patient.priority_score}\n"
+        f"   Age: {patient.age}, Temp: {patient.temperature}°C, BP: {patient.blood_pressure}\n\n"
+    )
+
+
+def iter_report_lines(queue):
+    """Yield the full report, header first, one patient entry at a time"""
+    yield REPORT_HEADER
+    for number, patient in enumerate(iter_patients_in_order(queue), 1):
+        yield format_patient_entry(number, patient)
+
+
+def page_count(queue, page_size):
+    """Number of pages the report takes (at least one)"""
+    return max(1, math.ceil(queue.get_queue_size() / page_size))
+
+
+def get_report_page(queue, page, page_size=50):
+    """Return the report text for one 0-based page"""
+    first = page * page_size
+    patients = heapq.nsmallest(first + page_size, queue.patients, key=report_order)[first:]
+    return "".join(format_patient_entry(number, patient) for number, patient in enumerate(patients, first + 1))
+
+
+def export_report(queue, path):
+    """Stream the whole report to a file and return the number of patients"""
+    with open(path, "w") as f:
+        f.writelines(iter_report_lines(queue))
+    return queue.get_queue_size()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+
+import sys
+import argparse
+import fileinput
+import importlib
+from itertools import islice
+
+TRUE_WORDS = {"1", "true", "yes", "y"}
+FALSE_WORDS = {"0", "false", "no", "n"}
+
+
+def parse_bool(text):
+    word = text.lower()
+    if word in TRUE_WORDS:
+        return True
+    if word in FALSE_WORDS:
+        return False
+    raise ValueError(f"expected yes/no, got {text!r}")
+
+
+def parse_fields(*types):
+    """Build a parser that splits a record into fields of the given types"""
+    def parse(line):
+        fields = line.split()
+        if len(fields) != len(types):
+            raise ValueError(f"expected {len(types)} field(s), got {len(fields)}")
+        return [convert(field) for convert, field in zip(types, fields)]
+    return parse
+
+
+# name -> (module, function, record parser, result formatter, help)
+# Modules are only imported once their subcommand is chosen.
+SUBCOMMANDS = {
+    "cube": (
+        "calculations_functions", "cube",
+        parse_fields(float), lambda result: f"{result:g}",
+        "cube each number"
+    ),
+    "triangle": (
+        "calculations_functions", "area_of_triangle",
+        parse_fields(float, float), lambda result: f"{result:g}",
+        "area of a triangle for each 'width height' record"
+    ),
+    "even": (
+        "testing_file", "is_even",
+        parse_fields(int), lambda result: "even" if result else "odd",
+        "say whether each number is even or odd"
+    ),
+    "risk": (
+        "calculations_functions", "calculate_risk",
+        parse_fields(int, parse_bool, parse_bool), lambda result: f"{result}/10",
+        "risk score for each 'open_ports has_smb has_ssh' record"
+    ),
+    "password": (
+        "calculations_functions", "password_strength",
+        parse_fields(int, parse_bool, parse_bool), lambda result: f"{result}/10",
+        "strength for each 'length has_uppercase has_symbols' record"
+    ),
+    "port": (
+        "port_classifier", "classify_port",
+        parse_fields(int), str,
+        "describe each port number"
+    ),
+}
+
+
+def run_batches(function, parse, format_result, lines, batch_size, out=sys.stdout, err=sys.stderr):
+    """Process records in batches and return how many could not be parsed"""
+    errors = 0
+    line_number = 0
+
+    while True:
+        batch = list(islice(lines, batch_size))
+        if not batch:
+            return errors
+
+        output = []
+        for line in batch:
+            line_number += 1
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            try:
+                output.append(format_result(function(*parse(line))) + "\n")
+            except (ValueError, ArithmeticError) as e:
+                errors += 1
+                err.write(f"line {line_number}: {e}\n")
+        out.writelines(output)
+
+
+def positive_int(text):
+    """argparse type for counts that must be at least 1"""
+    value = int(text)
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return value
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the practice exercises over many inputs at once.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    for name, (_, _, _, _, help_text) in SUBCOMMANDS.items():
+        sub = subparsers.add_parser(name, help=help_text)
+        sub.add_argument("files", nargs="*", help="input files, one record per line (default: stdin)")
+        sub.add_argument("-b", "--batch-size", type=positive_int, default=10000, help="records per batch")
+
+    args = parser.parse_args(argv)
+    module_name, function_name, parse, format_result, _ = SUBCOMMANDS[args.command]
+    function = getattr(importlib.import_module(module_name), function_name)
+
+    with fileinput.input(args.files or ["-"]) as lines:
+        errors = run_batches(function, parse, format_result, lines, args.batch_size)
+
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,10 +3,11 @@
 def networking_protocols(Ip_address, port):
 	print(f"Hello, my ip address is {Ip_address} and my port is {port} .")
 	
-Ip_address = input("Enter Ip_address: ")
-port = int(input("Enter port: "))
+if __name__ == "__main__":
+	Ip_address = input("Enter Ip_address: ")
+	port = int(input("Enter port: "))
 
-networking_protocols(Ip_address, port)
+	networking_protocols(Ip_address, port)
 
 
 
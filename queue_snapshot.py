@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import time
+import heapq
+import struct
+from collections import namedtuple
+from multiprocessing import shared_memory, resource_tracker
+
+from patient_report import report_order
+
+# Header: sequence number, records written, record capacity, full queue size.
+# The sequence is odd while the publisher is writing and even otherwise.
+HEADER = struct.Struct("<QIII")
+SEQUENCE = struct.Struct("<Q")
+COUNTS = struct.Struct("<III")
+
+# One fixed-size record per patient, in priority order
+RECORD = struct.Struct("<IHBBfHHd32s")
+NAME_BYTES = 32
+
+# Names of blocks created by publishers in this process
+_local_blocks = set()
+
+PatientRecord = namedtuple(
+    "PatientRecord",
+    ["id", "priority_score", "severity_level", "age", "temperature",
+     "systolic", "diastolic", "arrival_time", "name"]
+)
+
+
+def clamp(value, high):
+    """Fit a value into an unsigned field, using 0 for anything unusable"""
+    try:
+        return max(0, min(int(value), high))
+    except (TypeError, ValueError, OverflowError):
+        return 0
+
+
+def pack_patient(patient, buffer, offset):
+    """Write one patient into `buffer` at `offset`"""
+    systolic, _, diastolic = patient.blood_pressure.partition('/')
+    RECORD.pack_into(
+        buffer, offset,
+        clamp(getattr(patient, 'id', 0), 0xFFFFFFFF),
+        clamp(patient.priority_score, 0xFFFF),
+        clamp(patient.severity_level, 0xFF),
+        clamp(patient.age, 0xFF),
+        float(patient.temperature),
+        clamp(systolic, 0xFFFF),
+        clamp(diastolic, 0xFFFF),
+        patient.arrival_time.timestamp(),
+        patient.name.encode("utf-8")[:NAME_BYTES]
+    )
+
+
+def unpack_record(fields):
+    """Turn a raw RECORD tuple into a PatientRecord"""
+    name = fields[-1].rstrip(b"\0").decode("utf-8", "ignore")
+    return PatientRecord(*fields[:-1], name)
+
+
+class QueueSnapshotPublisher:
+    """Publish a read-only copy of a PriorityQueue into shared memory"""
+    def __init__(self, name=None, capacity=1000):
+        self.capacity = capacity
+        size = HEADER.size + capacity * RECORD.size
+        self.shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        self.name = self.shm.name
+        self.sequence = 0
+        self.closed = False
+        _local_blocks.add(self.name)
+
+        # Records are packed here first so the window in which readers
+        # see an odd sequence is just one memory copy
+        self.staging = bytearray(capacity * RECORD.size)
+        HEADER.pack_into(self.shm.buf, 0, 0, 0, capacity, 0)
+
+    def publish(self, queue):
+        """Copy the current queue (top `capacity` patients) into shared memory"""
+        patients = heapq.nsmallest(self.capacity, queue.patients, key=report_order)
+        for i, patient in enumerate(patients):
+            pack_patient(patient, self.staging, i * RECORD.size)
+        length = len(patients) * RECORD.size
+
+        # Everything is written while the sequence is odd; the even
+        # sequence goes in last, on its own, to mark the snapshot complete
+        buf = self.shm.buf
+        self.sequence += 1
+        SEQUENCE.pack_into(buf, 0, self.sequence)
+        COUNTS.pack_into(buf, SEQUENCE.size, len(patients), self.capacity, queue.get_queue_size())
+        buf[HEADER.size:HEADER.size + length] = self.staging[:length]
+        self.sequence += 1
+        SEQUENCE.pack_into(buf, 0, self.sequence)
+
+    def close(self):
+        """Release and remove the shared memory block (safe to call twice)"""
+        if self.closed:
+            return
+        self.closed = True
+        _local_blocks.discard(self.name)
+        self.shm.close()
+        self.shm.unlink()
+
+
+class QueueSnapshotReader:
+    """Attach to a published queue snapshot from another process"""
+    def __init__(self, name):
+        # Readers only borrow the block; if the resource tracker knew about
+        # it, it would unlink it when this process exits
+        try:
+            self.shm = shared_memory.SharedMemory(name=name, track=False)
+        except TypeError:
+            # Python before 3.13 has no track argument. Attaching registered
+            # the block, so undo that, unless a publisher in this process
+            # created it: the registration is then the publisher's, and
+            # removing it would break its unlink() later.
+            self.shm = shared_memory.SharedMemory(name=name)
+            if os.name == "posix" and self.shm.name not in _local_blocks:
+                resource_tracker.unregister("/" + self.shm.name, "shared_memory")
+
+    def view(self, timeout=1.0):
+        """Return (version, queue_size, memoryview of the records) without copying
+
+        The view is only trustworthy if is_current(version) is still True
+        once you have finished with it. Release the view before close().
+        Raises TimeoutError if the publisher stays mid-write for `timeout`
+        seconds, e.g. because it died while publishing.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            sequence, count, capacity, queue_size = HEADER.unpack_from(self.shm.buf, 0)
+            if sequence % 2 == 0:
+                # A torn header is caught by is_current(); until then just
+                # keep the slice inside the record area
+                start = HEADER.size
+                return sequence, queue_size, self.shm.buf[start:start + min(count, capacity) * RECORD.size]
+            if time.monotonic() > deadline:
+                raise TimeoutError("Queue snapshot publisher did not finish writing.")
+            time.sleep(0)
+
+    def is_current(self, version):
+        """True if nothing has been published since `version` was read"""
+        return SEQUENCE.unpack_from(self.shm.buf, 0)[0] == version
+
+    def read(self, timeout=1.0):
+        """Return (version, queue_size, list of PatientRecord) from one consistent snapshot
+
+        Raises TimeoutError if no consistent snapshot is seen in `timeout` seconds.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            version, queue_size, view = self.view(max(deadline - time.monotonic(), 0))
+            with view:
+                records = [unpack_record(fields) for fields in RECORD.iter_unpack(view)]
+            if self.is_current(version):
+                return version, queue_size, records
+            if time.monotonic() > deadline:
+                raise TimeoutError("Queue snapshot kept changing while being read.")
+
+    def close(self):
+        self.shm.close()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print("Usage: queue_snapshot.py SHARED_MEMORY_NAME")
+        sys.exit(1)
+
+    reader = QueueSnapshotReader(sys.argv[1])
+    version, queue_size, records = reader.read()
+    print(f"Snapshot version {version}: {queue_size} patient(s) in queue.")
+    for record in records:
+        print(f"{record.id}. {record.name} (Severity: {record.severity_level}, Priority: {record.priority_score})")
+    reader.close()
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+
+import sqlite3
+import time
+
+from classes_intro import PortList
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scans (
+    id INTEGER PRIMARY KEY,
+    started_at REAL NOT NULL,
+    finished_at REAL
+);
+
+-- Every host probed in a scan, even ones with nothing open
+CREATE TABLE IF NOT EXISTS scan_hosts (
+    scan_id INTEGER NOT NULL,
+    ip TEXT NOT NULL,
+    PRIMARY KEY (scan_id, ip)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS results (
+    scan_id INTEGER NOT NULL,
+    ip TEXT NOT NULL,
+    port INTEGER NOT NULL,
+    PRIMARY KEY (scan_id, ip, port)
+) WITHOUT ROWID;
+
+-- Latest state per host, used to pick what to rescan first
+CREATE TABLE IF NOT EXISTS hosts (
+    ip TEXT PRIMARY KEY,
+    last_scan_id INTEGER NOT NULL,
+    last_scanned REAL NOT NULL,
+    changed INTEGER NOT NULL DEFAULT 0
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS hosts_by_age ON hosts (changed DESC, last_scanned);
+"""
+
+
+class ScanStore:
+    """SQLite store of scan results, indexed by scan, host and port"""
+    def __init__(self, path="scan_results.db"):
+        self.conn = sqlite3.connect(path)
+
+        # WAL lets readers (reports, diffs) run while a scan is writing
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def start_scan(self):
+        """Open a new scan and return its id"""
+        with self.conn:
+            cursor = self.conn.execute("INSERT INTO scans (started_at) VALUES (?)", (time.time(),))
+        return cursor.lastrowid
+
+    def finish_scan(self, scan_id):
+        """Mark a scan as complete"""
+        with self.conn:
+            self.conn.execute("UPDATE scans SET finished_at = ? WHERE id = ?", (time.time(), scan_id))
+
+    def record_hosts(self, scan_id, port_lists):
+        """Save a batch of PortList results for one scan in a single transaction"""
+        now = time.time()
+        with self.conn:
+            for target in port_lists:
+                ports = set(target.open_ports)
+                previous = self.conn.execute(
+                    "SELECT last_scan_id FROM hosts WHERE ip = ?", (target.ip,)
+                ).fetchone()
+
+                changed = 0
+                if previous is not None:
+                    old_ports = {
+                        row[0] for row in self.conn.execute(
+                            "SELECT port FROM results WHERE scan_id = ? AND ip = ?",
+                            (previous[0], target.ip)
+                        )
+                    }
+                    changed = int(old_ports != ports)
+
+                self.conn.execute("INSERT OR IGNORE INTO scan_hosts (scan_id, ip) VALUES (?, ?)", (scan_id, target.ip))
+                self.conn.executemany(
+                    "INSERT OR IGNORE INTO results (scan_id, ip, port) VALUES (?, ?, ?)",
+                    ((scan_id, target.ip, port) for port in ports)
+                )
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO hosts (ip, last_scan_id, last_scanned, changed) VALUES (?, ?, ?, ?)",
+                    (target.ip, scan_id, now, changed)
+                )
+
+    def load_host(self, ip):
+        """Return the latest PortList for a host, or None if never scanned"""
+        row = self.conn.execute("SELECT last_scan_id FROM hosts WHERE ip = ?", (ip,)).fetchone()
+        if row is None:
+            return None
+
+        ports = [
+            port for (port,) in self.conn.execute(
+                "SELECT port FROM results WHERE scan_id = ? AND ip = ? ORDER BY port", (row[0], ip)
+            )
+        ]
+        return PortList(ip, ports)
+
+    def hosts_to_rescan(self, hosts=None, max_age=3600):
+        """Return hosts due a rescan: changed ones first, then oldest first
+
+        Hosts in `hosts` that have never been scanned come first of all.
+        Leave `hosts` as None to consider only hosts already in the store.
+        """
+        cutoff = time.time() - max_age
+        due = [
+            ip for (ip,) in self.conn.execute(
+                "SELECT ip FROM hosts WHERE changed = 1 OR last_scanned < ? "
+                "ORDER BY changed DESC, last_scanned",
+                (cutoff,)
+            )
+        ]
+        if hosts is None:
+            return due
+
+        wanted = set(hosts)
+        known = {ip for (ip,) in self.conn.execute("SELECT ip FROM hosts")}
+        new = [ip for ip in hosts if ip not in known]
+        return new + [ip for ip in due if ip in wanted]
+
+    def diff(self, old_scan_id, new_scan_id):
+        """Return (opened, closed) sets of (ip, port) between two scans
+
+        Only hosts probed in both scans are compared, so an incremental
+        rescan does not report every host it skipped as closed.
+        """
+        opened = self.conn.execute(
+            "SELECT r.ip, r.port FROM results r "
+            "JOIN scan_hosts h ON h.scan_id = ? AND h.ip = r.ip "
+            "WHERE r.scan_id = ? "
+            "EXCEPT SELECT ip, port FROM results WHERE scan_id = ?",
+            (old_scan_id, new_scan_id, old_scan_id)
+        ).fetchall()
+        closed = self.conn.execute(
+            "SELECT r.ip, r.port FROM results r "
+            "JOIN scan_hosts h ON h.scan_id = ? AND h.ip = r.ip "
+            "WHERE r.scan_id = ? "
+            "EXCEPT SELECT ip, port FROM results WHERE scan_id = ?",
+            (new_scan_id, old_scan_id, new_scan_id)
+        ).fetchall()
+        return set(opened), set(closed)
+
+
+def incremental_rescan(store, probe, hosts=None, max_age=3600, batch_size=500):
+    """Probe the hosts that are due, most likely to have changed first
+
+    `probe` is any function that takes an IP and returns its open ports.
+    Returns the id of the new scan.
+    """
+    scan_id = store.start_scan()
+    batch = []
+    for ip in store.hosts_to_rescan(hosts, max_age):
+        batch.append(PortList(ip, probe(ip)))
+        if len(batch) >= batch_size:
+            store.record_hosts(scan_id, batch)
+            batch = []
+
+    if batch:
+        store.record_hosts(scan_id, batch)
+    store.finish_scan(scan_id)
+    return scan_id
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+
+import math
+from collections import deque
+from datetime import datetime, timedelta
+
+
+class WaitTimeSketch:
+    """Streaming histogram of wait times with logarithmic buckets
+
+    Each bucket covers a range about 4% wide, so any quantile comes back
+    within that relative error. Waits are clamped to MAX_WAIT seconds,
+    which caps the number of buckets no matter how many calls are added.
+    """
+    GROWTH = 1.04
+    MAX_WAIT = 7 * 24 * 3600
+    BUCKETS = int(math.log(MAX_WAIT, GROWTH)) + 2
+
+    def __init__(self):
+        self.counts = [0] * self.BUCKETS
+        self.total = 0
+
+    def _bucket(self, seconds):
+        """Map a wait in seconds to its bucket (bucket 0 holds waits under 1s)"""
+        if seconds < 1:
+            return 0
+        seconds = min(seconds, self.MAX_WAIT)
+        return min(int(math.log(seconds, self.GROWTH)) + 1, self.BUCKETS - 1)
+
+    def add(self, seconds):
+        """Count one wait time"""
+        self.counts[self._bucket(seconds)] += 1
+        self.total += 1
+
+    def merge(self, other):
+        """Fold another sketch's counts into this one"""
+        for i, count in enumerate(other.counts):
+            self.counts[i] += count
+        self.total += other.total
+
+    def quantile(self, q):
+        """Return the approximate q-quantile wait in seconds (None if empty)"""
+        if self.total == 0:
+            return None
+
+        rank = q * (self.total - 1)
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if seen > rank:
+                if i == 0:
+                    return 0.0
+                # Middle of the bucket's [GROWTH^(i-1), GROWTH^i) range
+                return self.GROWTH ** (i - 1) * (1 + self.GROWTH) / 2
+        return float(self.MAX_WAIT)
+
+
+class ServedHistory:
+    """Recent served patients plus hourly wait time sketches per severity"""
+    def __init__(self, max_records=1000, retention_hours=24):
+        # Ring buffer of (called_at, patient_id, name, severity, wait_seconds)
+        self.recent = deque(maxlen=max_records)
+        self.retention_hours = retention_hours
+
+        # severity -> deque of (hour_start, WaitTimeSketch), oldest first
+        self.hourly = {}
+        self.total_served = 0
+
+    def record(self, patient, called_at=None):
+        """Log a patient leaving the queue"""
+        called_at = called_at or datetime.now()
+        wait = max((called_at - patient.arrival_time).total_seconds(), 0.0)
+
+        self.recent.append((called_at, getattr(patient, 'id', None), patient.name, patient.severity_level, wait))
+        self.total_served += 1
+
+        hour = called_at.replace(minute=0, second=0, microsecond=0)
+        buckets = self.hourly.setdefault(patient.severity_level, deque())
+
+        # Calls normally arrive in time order, so search from the newest hour
+        position = len(buckets)
+        while position > 0 and buckets[position - 1][0] > hour:
+            position -= 1
+
+        if position > 0 and buckets[position - 1][0] == hour:
+            buckets[position - 1][1].add(wait)
+            return
+
+        sketch = WaitTimeSketch()
+        sketch.add(wait)
+        buckets.insert(position, (hour, sketch))
+        while len(buckets) > self.retention_hours:
+            buckets.popleft()
+
+    def wait_quantile(self, q, severity=None, hours=None, now=None):
+        """Approximate wait quantile in seconds over the last `hours` hours
+
+        Leave severity as None to include every severity level. Windows are
+        whole hours, counting the current hour as the first one.
+        """
+        now = now or datetime.now()
+        hours = min(hours or self.retention_hours, self.retention_hours)
+        since = now.replace(minute=0, second=0, microsecond=0) - timedelta(hours=hours - 1)
+
+        levels = [severity] if severity is not None else list(self.hourly)
+        merged = WaitTimeSketch()
+        for level in levels:
+            for start, sketch in self.hourly.get(level, ()):
+                if since <= start <= now:
+                    merged.merge(sketch)
+        return merged.quantile(q)
+
+    def served_count(self, severity=None, hours=None, now=None):
+        """Number of patients served over the last `hours` hours"""
+        now = now or datetime.now()
+        hours = min(hours or self.retention_hours, self.retention_hours)
+        since = now.replace(minute=0, second=0, microsecond=0) - timedelta(hours=hours - 1)
+
+        levels = [severity] if severity is not None else list(self.hourly)
+        return sum(
+            sketch.total
+            for level in levels
+            for start, sketch in self.hourly.get(level, ())
+            if since <= start <= now
+        )
+
+    def clear(self):
+        """Forget everything recorded so far"""
+        self.recent.clear()
+        self.hourly = {}
+        self.total_served = 0
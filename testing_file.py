@@ -6,11 +6,10 @@ def is_even(n):
 	else:
 		return False
 
-number = int(input("Enter a number: "))
-
-if is_even(number):
-	print("This is an even number.")
-else:
-	print("This is an odd number.")
-
+if __name__ == "__main__":
+	number = int(input("Enter a number: "))
 
+	if is_even(number):
+		print("This is an even number.")
+	else:
+		print("This is an odd number.")